@@ -90,17 +90,17 @@ class EPEAStar:
                 continue
             loop_counter += 1
 
-            # Check if the current state is a solution to the problem
-            if self.problem.is_solved(node.state):
+            # Check if the current state is a solution to the problem. The heuristic is only zero when every agent is on
+            # a goal of its color, so the full check is skipped for all other nodes.
+            if node.heuristic == 0 and self.problem.is_solved(node.state):
                 return convert_path(get_path(node)), node.cost
 
             # Expand the current node
-            child_states, next_value = self.problem.expand(node)
+            child_states, next_value = self.problem.expand(node, self.max_cost)
             nodes_expanded += 1
-            for child_state, cost in child_states:
+            for child_state, cost, heuristic in child_states:
                 if child_state not in seen and child_state != node.state:
                     # Create Node
-                    heuristic = self.problem.get_heuristic(child_state)
                     time = node.time + 1
                     collisions = 0
                     for agent in child_state.agents:
@@ -1,19 +1,43 @@
 from copy import copy
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict
 
 from src.solver.epeastar.epeastar import EPEAStar
 from src.solver.epeastar.mapf_problem import MAPFProblem
 from src.util.agent import Agent
 from src.util.cat import CAT
+from src.util.lru_cache import LRUCache
 from src.util.path import Path
 from src.util.path_set import PathSet
 
+SOLUTION_CACHE_SIZE = 4096
+
+
+class GroupKey:
+    """
+    Key of a group subproblem in the solution cache. The key contains every stored path, so its hash is computed once
+    instead of on every cache operation.
+    """
+
+    __slots__ = 'key', 'hash'
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.hash = hash(key)
+
+    def __eq__(self, other):
+        if not isinstance(other, GroupKey):
+            return NotImplemented
+        return self.hash == other.hash and self.key == other.key
+
+    def __hash__(self):
+        return self.hash
+
 
 def find_conflict(paths: List[Path]) -> Optional[Tuple[int, int]]:
     """
     Checks if there are vertex and edge conflicts between paths
     :param paths:   Paths to check conflicts with
-    :return:        Agent identifiers of first conflicting paths
+    :return:        Agent identifiers of the first conflicting pair in index order
     """
     for i in range(len(paths)):
         for j in range(i + 1, len(paths)):
@@ -33,7 +57,8 @@ class IDSolver:
                  agents: List[Agent],
                  cat: Optional[CAT],
                  stat_tracker,
-                 max_value=float('inf')):
+                 max_value=float('inf'),
+                 solution_cache: Optional[LRUCache] = None):
         """
         Constructs an IDSolver instance
         :param problem:         MAPF problem instance that needs to be solved
@@ -41,6 +66,8 @@ class IDSolver:
         :param cat:             Additional Collision Avoidance Table that should be used in calculating the result
         :param stat_tracker     Statistic tracker
         :param max_value:       Maximum allowed value of the solver. Stop the solver if the value is exceeded
+        :param solution_cache:  Cache with EPEA* solutions of groups. Can be shared between IDSolvers that solve the
+                                same problem with the same additional CAT. Solutions are not cached if omitted.
         """
         self.problem = problem
         self.agents = agents
@@ -51,6 +78,8 @@ class IDSolver:
             self.cats.append(cat)
         self.cats.append(self.path_set.cat)
         self.stat_tracker = stat_tracker
+        self.solution_cache = solution_cache
+        self.agent_to_group_idx: Dict[int, int] = {}  # Index in the list of groups of the group of every agent
 
     def solve(self) -> Optional[Tuple[list, int]]:
         """
@@ -63,24 +92,23 @@ class IDSolver:
         # Solve for every group
         for agent in agents:
             self.agents = [agent]
-            solver = EPEAStar(self.problem, self.agents, self.cats, self.stat_tracker,
-                              max_cost=self.path_set.get_remaining_cost([agent.identifier], self.max_value))
-            solution = solver.solve()
+            solution = self.solve_group(self.agents, self.cats)
             if solution is None:
                 return None
             agent_paths, cost = solution
             self.path_set.update(agent_paths)
 
+            self.agent_to_group_idx[agent.identifier] = len(groups)
             groups.append(([agent], cost))
 
         # Find and resolve conflicts until solution is conflict-free
-        conflict = self.path_set.find_conflict()
+        conflict = find_conflict(self.path_set.paths)
         while conflict is not None:
             a, b = conflict
             groups = self.merge_groups(groups, a, b, self.cats)
             if groups is None:
                 return None
-            conflict = self.path_set.find_conflict()
+            conflict = find_conflict(self.path_set.paths)
         return self.path_set.paths, sum(self.path_set.costs)
 
     def merge_groups(self,
@@ -96,20 +124,11 @@ class IDSolver:
         :param cats:        List of Collision Avoidance Tables
         :return:            New list of groups
         """
-        group_a = None
-        group_b = None
-        group_a_id = 0
-        for i, group in enumerate(groups):
-            for agent in group[0]:
-                if agent.identifier == agent_a_id:
-                    group_a = group
-                    group_a_id = i
-                    break
-                if agent.identifier == agent_b_id:
-                    group_b = group
-                    break
-        assert group_a is not None
-        assert group_b is not None
+        group_a_idx = self.agent_to_group_idx[agent_a_id]
+        group_b_idx = self.agent_to_group_idx[agent_b_id]
+        assert group_a_idx != group_b_idx
+        group_a = groups[group_a_idx]
+        group_b = groups[group_b_idx]
 
         # Combine groups a and b
         new_agents = group_a[0] + group_b[0]
@@ -118,17 +137,55 @@ class IDSolver:
 
         # Try to solve new group
         self.agents = new_agents
-        solver = EPEAStar(self.problem, self.agents, cats, self.stat_tracker,
-                          self.path_set.get_remaining_cost([agent.identifier for agent in new_agents], self.max_value))
-
-        solution = solver.solve()
+        solution = self.solve_group(self.agents, cats)
         if solution is None:
             return None
         group_paths, cost = solution
 
         self.path_set.update(group_paths)
 
-        groups[group_a_id] = (new_agents, cost)
-        groups.remove(group_b)
+        groups[group_a_idx] = (new_agents, cost)
+        for agent in group_b[0]:
+            self.agent_to_group_idx[agent.identifier] = group_a_idx
+
+        # Remove group b by moving the last group into its place, so only the indices of that group change
+        last_group = groups.pop()
+        if group_b_idx < len(groups):
+            groups[group_b_idx] = last_group
+            for agent in last_group[0]:
+                self.agent_to_group_idx[agent.identifier] = group_b_idx
 
         return groups
+
+    def solve_group(self, agents: List[Agent], cats: List[CAT]) -> Optional[Tuple[List[Path], int]]:
+        """
+        Solves a group of agents with EPEA*, reusing an earlier solution of the same subproblem if possible.
+        The subproblem is identified by the agents and by the paths that are currently stored, since those determine
+        the contents of the CAT.
+        :param agents:  Agents in the group
+        :param cats:    List of Collision Avoidance Tables
+        :return:        Paths of the agents in the group and the cost of the solution, or None if no solution exists
+                        within the remaining cost
+        """
+        max_cost = self.path_set.get_remaining_cost([agent.identifier for agent in agents], self.max_value)
+        # A merged agent set never repeats within one IDSolver, so a cache only pays off when it is shared
+        if self.solution_cache is None:
+            return EPEAStar(self.problem, agents, cats, self.stat_tracker, max_cost).solve()
+
+        key = GroupKey((tuple((agent.identifier, agent.coord.x, agent.coord.y, agent.color) for agent in agents),
+                        tuple(tuple(path.path) if path is not None else None for path in self.path_set.paths)))
+
+        cached = self.solution_cache.get(key)
+        if cached is not None:
+            solution, cached_max_cost = cached
+            # An optimal solution is valid for every maximum cost that exceeds its cost
+            if solution is not None:
+                return solution if solution[1] < max_cost else None
+            # No solution exists for a lower maximum cost either
+            if max_cost <= cached_max_cost:
+                return None
+
+        solver = EPEAStar(self.problem, agents, cats, self.stat_tracker, max_cost)
+        solution = solver.solve()
+        self.solution_cache.put(key, (solution, max_cost))
+        return solution
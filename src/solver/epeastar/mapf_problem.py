@@ -1,5 +1,5 @@
 import itertools
-from typing import List, Tuple
+from typing import List, Tuple, Dict, FrozenSet
 
 from mapfmclient import MarkedLocation
 
@@ -28,16 +28,27 @@ class MAPFProblem:
         self.goals = goals
         self.heuristic = heuristic
 
-    def on_goal(self, agent: Agent) -> bool:
+        # Goal positions grouped by color, so checking whether an agent is on a goal is a single set lookup
+        grouped_goals: Dict[int, List[Tuple[int, int]]] = dict()
+        for goal in goals:
+            grouped_goals.setdefault(goal.color, []).append((goal.x, goal.y))
+        self.goal_set: Dict[int, FrozenSet[Tuple[int, int]]] = {color: frozenset(positions) for color, positions in
+                                                                 grouped_goals.items()}
+
+    def get_on_goal_mask(self, state: State) -> int:
         """
-        Checks if an agent is on a goal of the correct color.
-        :param agent:   Agent to check if it is on its goal
-        :returns:        True if the agent is on a goal, False otherwise
+        Gets the bitmask of agents that are on a goal of their color. The mask is computed once and stored in the state.
+        :param state:   State to get the mask for
+        :returns:       Bitmask where bit i is set iff agent i is on a goal of its color
         """
-        for goal in self.goals:
-            if goal.x == agent.coord.x and goal.y == agent.coord.y and goal.color == agent.color:
-                return True
-        return False
+        if state.on_goal_mask is None:
+            goal_set = self.goal_set
+            on_goal_mask = 0
+            for i, agent in enumerate(state.agents):
+                if (agent.coord.x, agent.coord.y) in goal_set[agent.color]:
+                    on_goal_mask |= 1 << i
+            state.on_goal_mask = on_goal_mask
+        return state.on_goal_mask
 
     def is_solved(self, state: State) -> bool:
         """
@@ -45,40 +56,46 @@ class MAPFProblem:
         :param state:   State for which it should be checked
         :returns:       True if state is a solution, False otherwise
         """
-        return all(self.on_goal(agent) for agent in state.agents)
+        goal_set = self.goal_set
+        return all((agent.coord.x, agent.coord.y) in goal_set[agent.color] for agent in state.agents)
 
-    def expand(self, node: Node) -> Tuple[List[Tuple[State, int]], int]:
+    def expand(self, node: Node, max_cost: float = float('inf')) -> Tuple[List[Tuple[State, int, int]], int]:
         """
         Expands an A* search tree node.
-        :param node:    parent node
-        :returns:       List of child nodes and the next Δf value for the parent node
+        :param node:        parent node
+        :param max_cost:    Children with a value of at least max_cost are not needed by the solver
+        :returns:           List of child states with their costs and heuristics, and the next Δf value for the parent
+                            node
         """
         v = node.delta_f
-        children, next_value = self.get_children(node, v)
+
+        # A child has the value of the parent plus its Δf, except for agents that wait on their goal, since their cost
+        # is only added once they move away. Operators with a higher Δf than this bound only create unneeded children.
+        known_upper_bound = max_cost - node.cost - node.heuristic
+        if known_upper_bound != float('inf'):
+            known_upper_bound += bin(self.get_on_goal_mask(node.state)).count('1')
+        children, next_value = self.get_children(node, v, known_upper_bound)
+
+        # Index of the agent at every vertex occupied in the parent state, used to look up edge conflicts
+        parent_agents = node.state.agents
+        parent_indices = {agent.packed: i for i, agent in enumerate(parent_agents)}
 
         # Check constraints
         selected_children = []
-        for child_state, cost in children:
-            coords = set()
-            edge_conflict = False
-            vertex_conflict = False
-            for i, agent in enumerate(child_state.agents):
-                # Check vertex conflict
-                if agent.coord in coords:
-                    vertex_conflict = True
-                    break
-                coords.add(agent.coord)
-
-                # Check edge conflicts
-                for j in range(i + 1, len(node.state.agents)):
-                    if child_state.agents[i].coord == node.state.agents[j].coord and child_state.agents[j].coord == \
-                            node.state.agents[i].coord:
-                        edge_conflict = True
-                        break
-                if edge_conflict:
+        for child_state, cost, heuristic in children:
+            child_agents = child_state.agents
+
+            # Check vertex conflicts
+            if len({agent.packed for agent in child_agents}) < len(child_agents):
+                continue
+
+            # Check edge conflicts: agent i moves to the vertex of agent j while agent j moves to the vertex of agent i
+            for i, agent in enumerate(child_agents):
+                j = parent_indices.get(agent.packed)
+                if j is not None and j != i and child_agents[j].packed == parent_agents[i].packed:
                     break
-            if not vertex_conflict and not edge_conflict:
-                selected_children.append((child_state, cost))
+            else:
+                selected_children.append((child_state, cost, heuristic))
         return selected_children, next_value
 
     def get_heuristic(self, state: State) -> int:
@@ -101,11 +118,18 @@ class MAPFProblem:
         """
         assert len(operator) == len(parent.state.agents)
 
+        # If no agent is on its goal, there are no waiting costs and every agent adds 1 to the cost
+        on_goal_mask = self.get_on_goal_mask(parent.state)
+        if on_goal_mask == 0:
+            agents = [Agent(agent.coord.move(direction), agent.color, agent.identifier)
+                      for agent, direction in zip(parent.state.agents, operator)]
+            return State(agents), parent.cost + len(agents)
+
         agents = []
         costs = parent.cost
         for i, agent in enumerate(parent.state.agents):
             waiting_costs = 0
-            if self.on_goal(agent):
+            if on_goal_mask >> i & 1:
                 if operator[i] is not Direction.WAIT:
                     costs += agent.waiting_cost + 1
                 else:
@@ -118,20 +142,28 @@ class MAPFProblem:
         child_state = State(agents)
         return child_state, costs
 
-    def get_children(self, parent: Node, v: int) -> Tuple[List[Tuple[State, int]], int]:
+    def get_children(self,
+                     parent: Node,
+                     v: int,
+                     known_upper_bound: float = float('inf')) -> Tuple[List[Tuple[State, int, int]], int]:
         """
         Uses the operator selection function (OSF) to get all relevant children from the parent node.
-        :param parent:  Parent node
-        :param v:       The Δf value.
-        :returns:       List of child states together with their costs and next Δf value for the parent node
+        :param parent:              Parent node
+        :param v:                   The Δf value.
+        :param known_upper_bound:   Δf values of at least this bound are not useful
+        :returns:                   List of child states together with their costs and heuristics, and next Δf value for
+                                    the parent node
         """
         operator_finder = OperatorFinder(v, [self.osf.pdb[agent.color][agent.coord.y][agent.coord.x] for agent in
                                              parent.state.agents])
-        operator_finder.find_operators(0, [], 0)
-
-        expanded_operators = []
-        for operator in operator_finder.operators:
-            expanded_operators += list(itertools.product(*operator))
-
-        children = [self.get_child(parent, operator) for operator in expanded_operators]
+        operator_finder.find_operators(known_upper_bound)
+
+        # Every row contains several directions with the same Δf, so each combination of rows is expanded into the
+        # cartesian product of its directions. Children are created directly from the product iterator.
+        # The Δf of a move is 1 + h(new position) - h(old position), and the Δf values of all selected operators sum to
+        # v. Therefore, every child has the same heuristic, which follows from the heuristic of the parent.
+        heuristic = parent.heuristic + v - len(parent.state.agents)
+        children = [(*self.get_child(parent, operator), heuristic)
+                    for operators in operator_finder.operators
+                    for operator in itertools.product(*operators)]
         return children, operator_finder.next_target_value
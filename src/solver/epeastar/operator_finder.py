@@ -1,4 +1,4 @@
-from copy import copy
+from bisect import bisect_left, bisect_right
 from typing import List
 
 from src.solver.epeastar.pdb_generator import PDBTable
@@ -28,47 +28,88 @@ class OperatorFinder:
         self.max_values = []
         s_min = 0
         s_max = 0
-        for operators in reversed(agent_operators):
+        for delta_fs, _ in reversed(agent_operators):
             self.min_values.append(s_min)
             self.max_values.append(s_max)
-            s_min += operators[0][1]
-            s_max += operators[-1][1]
+            s_min += delta_fs[0]
+            s_max += delta_fs[-1]
         self.min_values.reverse()
         self.max_values.reverse()
 
-    def find_operators(self,
-                       current_agent: int,
-                       previous_operators: List[List[Direction]],
-                       previous_sum: int) -> None:
+    def find_operators(self, known_upper_bound: float = float('inf')) -> None:
         """
         Finds all combinations of operators where the sum of delta values is equal to self.target_sum.
-        Results are stored in self.operators
-        :param current_agent:       Index of the agent for which operators are being evaluated (recursive tree depth)
-        :param previous_operators:  Operators that were picked for agents with a lower index
-        :param previous_sum:        Sum of delta values for all previous operators
+        Results are stored in self.operators.
+        The operator tree is searched depth-first using an explicit stack instead of recursion. Since the operators of
+        every agent are sorted on Δf, the operators that can still reach the target sum form a consecutive range, which
+        is found with a binary search on the table of the agent when a tree depth is entered. For every agent (tree
+        depth) the stack stores the index of the next operator in that range. The picked indices are stored in a single
+        preallocated list that is overwritten in place, and are only converted to directions when a combination reaches
+        the target sum.
+        :param known_upper_bound:   Sums of delta values that are at least this bound are not useful to the caller. If
+                                    the target sum is at least the bound, no operators are searched. Next target
+                                    values that are at least the bound are not stored.
         :return:                    Nothing
         """
-        # For each operator of the current agent
-        for i, operator in enumerate(self.agent_operators[current_agent]):
-            current_operators = copy(previous_operators)
-            current_operators.append(operator[0])
-            current_sum = previous_sum + operator[1]
+        if self.target_sum >= known_upper_bound:
+            return
 
-            # If the minimum possible value is larger than the target value, return and update the next target value
-            if current_sum + self.min_values[current_agent] > self.target_sum:
-                self.next_target_value = min(self.next_target_value, current_sum + self.min_values[current_agent])
-                return
+        # Attributes are bound to local variables, since local variable lookups are much faster in the loop below
+        agent_operators = self.agent_operators
+        append_operators = self.operators.append
+        next_target_value = min(self.next_target_value, known_upper_bound)
+        n = len(agent_operators)
+        last_depth = n - 1
+        target_sum = self.target_sum
+        min_values = self.min_values
+        # The partial sum at a depth can only reach the target sum if it lies within [lower_bound, upper_bound]
+        upper_bounds = [target_sum - min_value for min_value in min_values]
+        lower_bounds = [target_sum - max_value for max_value in self.max_values]
+        stack_i = [0] * n
+        stack_end = [0] * n
+        partial_sums = [0] * n  # Sum of delta values for all operators picked for agents with a lower index
+        current_operators = [0] * n  # Index of the operator picked for every agent
 
-            # If this is the bottom of the recursive tree, check if the target sum is reached
-            if current_agent == len(self.agent_operators) - 1:
-                if current_sum == self.target_sum:
-                    self.operators.append(current_operators)
-                continue
+        depth = 0
+        descending = True
+        while depth >= 0:
+            if descending:
+                partial_sum = partial_sums[depth]
+                delta_fs = agent_operators[depth][0]
+
+                # Operators from limit onwards exceed the target sum. The first of them determines the next target value
+                limit = bisect_right(delta_fs, upper_bounds[depth] - partial_sum)
+                if limit < len(delta_fs) and partial_sum + delta_fs[limit] + min_values[depth] < next_target_value:
+                    next_target_value = partial_sum + delta_fs[limit] + min_values[depth]
+
+                # Operators before start can not reach the target sum anymore
+                start = bisect_left(delta_fs, lower_bounds[depth] - partial_sum, 0, limit)
+
+                # At the bottom of the tree, all operators in the range reach the target sum exactly
+                if depth == last_depth:
+                    for i in range(start, limit):
+                        current_operators[depth] = i
+                        append_operators([table[1][index] for table, index in zip(agent_operators, current_operators)])
+                    depth -= 1
+                    descending = False
+                    continue
+
+                stack_i[depth] = start
+                stack_end[depth] = limit
 
-            # If the maximum possible value is smaller than the target value, do not go deeper in recursion
-            if current_sum + self.max_values[current_agent] < self.target_sum:
+            # If all operators of the current agent have been evaluated, backtrack
+            i = stack_i[depth]
+            if i == stack_end[depth]:
+                depth -= 1
+                descending = False
                 continue
 
             # Find assignments for remaining agents
-            self.find_operators(current_agent + 1, current_operators, current_sum)
-            assert self.next_target_value > self.target_sum
+            stack_i[depth] = i + 1
+            current_operators[depth] = i
+            partial_sums[depth + 1] = partial_sums[depth] + agent_operators[depth][0][i]
+            depth += 1
+            descending = True
+        assert next_target_value > target_sum
+        if next_target_value < known_upper_bound:
+            self.next_target_value = next_target_value
@@ -1,11 +1,21 @@
+from itertools import groupby
+from operator import itemgetter
 from typing import NewType, List, Tuple, Dict
 
 from src.solver.epeastar.heuristic import Heuristic
 from src.util.direction import Direction
 from src.util.grid import Grid
+from src.util.lru_cache import LRUCache
 
-PDBRow = NewType('PDBRow', Tuple[List[Direction], int])
-PDBTable = NewType('PDBTable', List[PDBRow])
+# A table is stored as a list of Δf values and a parallel list with the directions of every row. Tables are built once
+# when the PDB is constructed, and OperatorFinder searches them in place on every expansion.
+PDBTable = NewType('PDBTable', Tuple[List[int], List[List[Direction]]])
+
+PDB_CACHE_SIZE = 128
+
+# Single color PDBs of recently solved problems, keyed by the grid and the goal positions of the color. The cached
+# tables are shared between PDB instances and must not be mutated.
+PDB_CACHE = LRUCache(PDB_CACHE_SIZE)
 
 
 class PDB:
@@ -32,6 +42,14 @@ class PDB:
         :param grid:        2D grid of the problem instance
         :param heuristic:   Precomputed heuristic function
         """
+        # The PDB only depends on the grid and the goals of the color. Problems on the same grid, such as the
+        # subproblems of branch-and-bound, often share goals.
+        key = (grid.key, tuple(sorted((goal.x, goal.y) for goal in heuristic.grouped_goals[color])))
+        cached_osf = PDB_CACHE.get(key)
+        if cached_osf is not None:
+            self.pdb[color] = cached_osf
+            return
+
         single_color_osf: List[List[PDBTable]] = []
         for y in range(grid.height):
             osf_grid_row = []
@@ -41,12 +59,13 @@ class PDB:
                     osf_table = self.generate_osf_table(grid, x, y, heuristic, color)
                     osf_grid_row.append(osf_table)
                 else:
-                    osf_grid_row.append(PDBTable([]))
+                    osf_grid_row.append(PDBTable(([], [])))
             assert len(osf_grid_row) == grid.width
             single_color_osf.append(osf_grid_row)
 
         assert len(single_color_osf) == grid.height
         self.pdb[color] = single_color_osf
+        PDB_CACHE.put(key, single_color_osf)
 
     def generate_osf_table(self, grid: Grid, x: int, y: int, heuristic: Heuristic, color: int) -> PDBTable:
         """
@@ -70,28 +89,23 @@ class PDB:
 
         expanded_table.append((Direction.WAIT, 1))
         expanded_table.sort(key=(lambda row: row[1]))  # Sorting is very important for the algorithm in operator_finder
-        return PDBTable(self.collapse_osf_table(expanded_table))
+        return self.collapse_osf_table(expanded_table)
 
     @staticmethod
     def collapse_osf_table(table: List[Tuple[Direction, int]]) -> PDBTable:
         """
         Collapses directions with the same Δf value into the same row
         :param table:   Table sorted on Δf value
-        :return:        Collapsed table sorted on Δf value
+        :return:        Collapsed table sorted on Δf value, as a list of Δf values and a parallel list of directions
         """
         if len(table) == 0:
             print("Empty table")
-            return PDBTable([])
+            return PDBTable(([], []))
 
-        osf_table = []
-        last_df = table[0][1]
-        last_directions: List[Direction] = [table[0][0]]
-        for direction, df in table[1:]:
-            if df == last_df:
-                last_directions.append(direction)
-            else:
-                osf_table.append(PDBRow((last_directions, last_df)))
-                last_directions = [direction]
-                last_df = df
-        osf_table.append(PDBRow((last_directions, last_df)))
-        return PDBTable(osf_table)
+        # Since the table is sorted, directions with the same Δf value are consecutive
+        delta_fs = []
+        directions = []
+        for delta_f, rows in groupby(table, key=itemgetter(1)):
+            delta_fs.append(delta_f)
+            directions.append([direction for direction, _ in rows])
+        return PDBTable((delta_fs, directions))
@@ -8,7 +8,7 @@ from mapfmclient import MarkedLocation
 
 from src.solver.epeastar.epeastar import EPEAStar
 from src.solver.epeastar.heuristic import Heuristic
-from src.solver.epeastar.independence_detection import IDSolver
+from src.solver.epeastar.independence_detection import IDSolver, SOLUTION_CACHE_SIZE
 from src.solver.epeastar.mapf_problem import MAPFProblem
 from src.solver.epeastar.pdb_generator import PDB
 from src.util.agent import Agent
@@ -16,6 +16,7 @@ from src.util.coordinate import Coordinate
 from src.util.goal_assignment import GoalAssignment
 from src.util.grid import Grid
 from src.util.group import Group
+from src.util.lru_cache import LRUCache
 from src.util.path import Path
 from src.util.statistic_tracker import StatisticTracker
 
@@ -88,6 +89,10 @@ class ExhaustiveMatchingSolver:
 
         self.problem = MAPFProblem(self.goals, osf, heuristic)
 
+        # Goal assignments often share the goals of most agents, so EPEA* solutions of groups are shared between the
+        # IDSolvers of all goal assignments
+        self.solution_cache = LRUCache(SOLUTION_CACHE_SIZE)
+
     def solve(self) -> List[Path]:
         """
         Finds an optimal solution to the problem provided in the constructor.
@@ -207,7 +212,7 @@ class ExhaustiveMatchingSolver:
 
         self.stat_tracker.assignment_evaluated()
         if self.independence_detection:
-            solver = IDSolver(self.problem, agents, None, self.stat_tracker, min_cost)
+            solver = IDSolver(self.problem, agents, None, self.stat_tracker, min_cost, self.solution_cache)
         else:
             solver = EPEAStar(self.problem, agents, [], self.stat_tracker, min_cost)
 
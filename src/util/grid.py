@@ -5,7 +5,7 @@ from src.util.direction import Direction
 
 
 class Grid:
-    __slots__ = 'width', 'height', 'grid', 'agents', 'goals', 'colors', 'heuristic'
+    __slots__ = 'width', 'height', 'grid', 'key', 'agents', 'goals', 'colors', 'heuristic'
 
     def __init__(self, width: int, height: int, grid: List[List[int]]):
         """
@@ -17,6 +17,7 @@ class Grid:
         self.width = width
         self.height = height
         self.grid = grid
+        self.key = (width, height, tuple(tuple(row) for row in grid))  # Hashable key used to cache precomputed tables
 
     def __is_wall(self, x: int, y: int) -> bool:
         """
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Dictionary with a maximum number of entries. When the cache is full, the least recently used entry is removed.
+    """
+
+    __slots__ = 'max_size', 'entries'
+
+    def __init__(self, max_size: int):
+        """
+        Constructs an empty LRUCache instance
+        :param max_size:    Maximum number of entries that are kept in the cache
+        """
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default=None) -> Any:
+        """
+        Looks up an entry and marks it as most recently used
+        :param key:         Key of the entry
+        :param default:     Value that is returned if the key is not in the cache
+        :return:            Cached value, or default if the key is not in the cache
+        """
+        value = self.entries.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores an entry and removes the least recently used entry if the cache is full
+        :param key:     Key of the entry
+        :param value:   Value of the entry
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -51,28 +51,27 @@ class Path:
     def conflicts(self, other: Path):
         """
         Checks if two paths have either an edge conflict or a vertex conflict
+        The position lists are indexed directly, since going through __getitem__ for every position dominates the
+        running time of the check.
         :param other:   The other path to check conflicts with
         :return:        True if paths are conflicting, False otherwise
         """
-        n = len(self)
-        m = len(other)
-        i = 1
-        while i < n and i < m:
+        path1 = self.path
+        path2 = other.path
+        n = len(path1)
+        m = len(path2)
+        for i in range(1, min(n, m)):
             # Vertex conflict
-            if self[i] == other[i]:
+            if path1[i] == path2[i]:
                 return True
             # Edge conflict
-            if self[i] == other[i - 1] and self[i - 1] == other[i]:
+            if path1[i] == path2[i - 1] and path1[i - 1] == path2[i]:
                 return True
-            i += 1
-        while i < n:
-            if self[i] == other[-1]:
-                return True
-            i += 1
-        while i < m:
-            if self[-1] == other[i]:
-                return True
-            i += 1
+        # The agent that finished its path waits on its last position
+        if n > m:
+            return path2[-1] in path1[max(m, 1):]
+        if m > n:
+            return path1[-1] in path2[max(n, 1):]
         return False
 
     def get_cost(self):
@@ -1,4 +1,4 @@
-from typing import List, Optional, Iterator, Tuple
+from typing import List, Optional, Iterator
 
 from src.solver.epeastar.heuristic import Heuristic
 from src.util.agent import Agent
@@ -68,21 +68,6 @@ class PathSet:
         agent = next(agent for agent in self.agents if agent.identifier == agent_id)
         return self.heuristic.heuristic[agent.color][agent.coord.y][agent.coord.x]
 
-    def find_conflict(self) -> Optional[Tuple[int, int]]:
-        """
-        Find conflicting paths
-        :return:    ids of conflicting paths
-        """
-        for i in range(len(self.agents)):
-            id_i = self.agents[i].identifier
-            path_index_i = self.mapping[id_i]
-            for j in range(i + 1, len(self.agents)):
-                id_j = self.agents[j].identifier
-                path_index_j = self.mapping[id_j]
-                if self.paths[path_index_i].conflicts(self.paths[path_index_j]):
-                    return id_i, id_j
-        return None
-
     def __getitem__(self, agent_id):
         """
         Should always be used to get a path as internal index differs from id.
@@ -8,10 +8,11 @@ class State:
     A state in the MAPF(M) problem consists of the agent positions.
     """
 
-    __slots__ = 'agents'
+    __slots__ = 'agents', 'on_goal_mask'
 
     def __init__(self, agents: List[Agent]):
         self.agents = tuple(agents)
+        self.on_goal_mask = None  # Bit i is set iff agent i is on a goal of its color, computed by MAPFProblem
 
     def __eq__(self, other):
         return self.agents == other.agents